@@ -1,9 +1,10 @@
 import os
 import sys
+import bisect
 import requests
 import logging
 import warnings
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from urllib3.exceptions import InsecureRequestWarning
 
 
@@ -42,32 +43,91 @@ def init_headers(key, secret):
     token = f"{key}:{secret}"
     return {"Authorization": f"Bearer {token}"}
 
-# ---------------- check the anntionation and cal the expir time -----------------
-def is_expired(binding, logger):
-    ann = binding.get("annotations", {})
+# ---------------- tempbind annotation keys -----------------
+TEMPBIND_KEY = "rancher.io/tempbind"
+EXPIRES_AT_KEY = "rancher.io/tempbind-expires-at"
+# legacy variants: main.py wrote created/duration, test_curl.sh writes start/duration-minutes
+START_KEYS = ("rancher.io/tempbind-created", "rancher.io/tempbind-start")
+DURATION_KEYS = ("rancher.io/tempbind-duration", "rancher.io/tempbind-duration-minutes")
+
+
+def parse_time(value):
+    """
+    parse an ISO timestamp into an aware UTC datetime.
+    naive values are the legacy local-time format and are read as local time
+    """
+    dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return dt.astimezone(timezone.utc)
+
 
-    if ann.get("rancher.io/tempbind") != "true":
-        return False
+def _first(mapping, keys):
+    for k in keys:
+        if mapping.get(k):
+            return mapping[k]
+    return None
 
-    created_str = ann.get("rancher.io/tempbind-created")
-    duration_str = ann.get("rancher.io/tempbind-duration")
-    if not created_str or not duration_str:
-        return False
+
+# ---------------- check the anntionation and cal the expir time -----------------
+def get_expire_time(binding, logger):
+    """
+    return the UTC expire time of a tempbind binding, or None if it is not temporary
+    """
+    ann = binding.get("annotations") or {}
+    labels = binding.get("labels") or {}
+
+    if (
+        ann.get(TEMPBIND_KEY) != "true"
+        and EXPIRES_AT_KEY not in ann
+        and EXPIRES_AT_KEY not in labels
+    ):
+        return None
 
     try:
-        created_time = datetime.strptime(created_str, "%Y-%m-%dT%H:%M:%S")
-        duration = int(duration_str)
-        expire_time = created_time + timedelta(minutes=duration)
-        current_time = datetime.now()
-        print(current_time.strftime("%Y-%m-%d %H:%M:%S"), expire_time)
-        return current_time > expire_time
+        # 1. the precomputed expires-at written by bind
+        if ann.get(EXPIRES_AT_KEY):
+            return parse_time(ann[EXPIRES_AT_KEY])
+        if labels.get(EXPIRES_AT_KEY):
+            return datetime.fromtimestamp(int(labels[EXPIRES_AT_KEY]), timezone.utc)
+
+        # 2. legacy start + duration
+        start_str = _first(ann, START_KEYS)
+        duration_str = _first(ann, DURATION_KEYS)
+        if not start_str or not duration_str:
+            return None
+        return parse_time(start_str) + timedelta(minutes=int(duration_str))
     except Exception as e:
-        logger.warning(f"[failed] {e}")
-        return False
+        logger.warning(f"[failed] {binding.get('id')} {e}")
+        return None
+
+
+def build_expiry_index(session, url, headers, endpoints, logger):
+    """
+    collect every tempbind binding as (expire_time, ep, binding_id), sorted by expire_time
+    """
+    index = []
+    for ep in endpoints:
+        try:
+            # follow pagination.next so bindings past the first page are swept too
+            page_url = f"{url}/v3/{ep}"
+            while page_url:
+                resp = session.get(page_url, headers=headers, verify=False)
+                resp.raise_for_status()
+                page = resp.json()
+                for b in page.get("data", []):
+                    expire_time = get_expire_time(b, logger)
+                    if expire_time is not None:
+                        index.append((expire_time, ep, b["id"]))
+                page_url = (page.get("pagination") or {}).get("next")
+        except Exception as e:
+            logger.error(f"[unbind check] {ep} error: {e}")
+    index.sort()
+    return index
 
 
-def delete_binding(url, headers, ep, binding_id, logger):
-    resp = requests.delete(f"{url}/v3/{ep}/{binding_id}", headers=headers, verify=False)
+def delete_binding(session, url, headers, ep, binding_id, logger):
+    resp = session.delete(f"{url}/v3/{ep}/{binding_id}", headers=headers, verify=False)
     if resp.status_code in (200, 204):
         logger.info(f"[unbind] unbind successfully {binding_id}")
     else:
@@ -79,22 +139,25 @@ def delete_binding(url, headers, ep, binding_id, logger):
 def check_and_unbind_expired(url, headers, logger):
     # define API endpoints
     endpoints = [
-        ("globalrolebindings", "globalRoleId"),
-        ("clusterroletemplatebindings", "roleTemplateId"),
-        ("projectroletemplatebindings", "roleTemplateId"),
+        "globalrolebindings",
+        "clusterroletemplatebindings",
+        "projectroletemplatebindings",
     ]
 
-    for ep, _ in endpoints:
-        try:
-            resp = requests.get(f"{url}/v3/{ep}", headers=headers, verify=False)
-            bindings = resp.json().get("data", [])
-            for b in bindings:
-                if is_expired(b, logger):
-                    logger.info(f"[unbind check] {ep} {b['id']} expired")
-                    delete_binding(url, headers, ep, b["id"], logger)
+    # one pooled connection for every page fetch and delete of the sweep
+    session = requests.Session()
+    index = build_expiry_index(session, url, headers, endpoints, logger)
+    now = datetime.now(timezone.utc)
+    # the index is sorted, so everything before the first non-expired entry is expired
+    expired = index[: bisect.bisect_left(index, (now,))]
+    logger.info(f"[unbind check] {len(index)} tempbind bindings, {len(expired)} expired")
 
+    for expire_time, ep, binding_id in expired:
+        logger.info(f"[unbind check] {ep} {binding_id} expired at {expire_time.isoformat()}")
+        try:
+            delete_binding(session, url, headers, ep, binding_id, logger)
         except Exception as e:
-            logger.error(f"[unbind check] {ep} error: {e}")
+            logger.error(f"[unbind check] {ep} {binding_id} error: {e}")
 
 
 def main():
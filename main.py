@@ -11,24 +11,30 @@ features:
  7. list all role bindings for user
  8. bind role to user
  9. unbind role from user
+ 10. interactive shell with cached lookups
 """
 import os
 import sys
 import json
 import requests
 import argparse
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 
 from urllib3.exceptions import InsecureRequestWarning
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from rancher_cli.config import init_logger, init_config, init_headers
 
+# one pooled connection per host, shared by every request of the process
+session = requests.Session()
 
 
 # ------------------- support function -------------------
 def get_user_id(username, url, headers, logger):
     logger.info(f"query the userName: {username}")
-    resp = requests.get(
+    resp = session.get(
         f"{url}/v3/users?username={username}", headers=headers, verify=False
     )
     resp.raise_for_status()
@@ -42,7 +48,7 @@ def get_user_id(username, url, headers, logger):
 
 def get_cluster_id(cluster_name, url, headers, logger):
     logger.info(f"query the clusterName: {cluster_name}")
-    resp = requests.get(
+    resp = session.get(
         f"{url}/v3/clusters?name={cluster_name}", headers=headers, verify=False
     )
     resp.raise_for_status()
@@ -58,7 +64,7 @@ def get_cluster_id(cluster_name, url, headers, logger):
 
 def get_cluster_members(cluster_id, url, headers, logger):
     logger.info(f"query the clusterMembers: {cluster_id}")
-    resp = requests.get(
+    resp = session.get(
         f"{url}/v3/clusterRoleTemplateBindings?clusterId={cluster_id}",
         headers=headers,
         verify=False,
@@ -87,7 +93,7 @@ def list_cluster_members(cluster_name, url, headers, logger):
 
 def get_all_users(url, headers, logger):
     logger.info("get all users")
-    resp = requests.get(f"{url}/v3/users", headers=headers, verify=False)
+    resp = session.get(f"{url}/v3/users", headers=headers, verify=False)
     resp.raise_for_status()
     return [(u["id"], u.get("name", "")) for u in resp.json().get("data", [])]
 
@@ -103,10 +109,9 @@ def list_users(url, headers, logger):
 
 def get_clusters(url, headers, logger):
     logger.info("get all clusters")
-    resp = requests.get(f"{url}/v3/clusters", headers=headers, verify=False)
+    resp = session.get(f"{url}/v3/clusters", headers=headers, verify=False)
     resp.raise_for_status()
-    for c in resp.json().get("data", []):
-        return [(c["id"], c.get("name", ""))]
+    return [(c["id"], c.get("name", "")) for c in resp.json().get("data", [])]
 
 def list_clusters(url, headers, logger):
     clusters = get_clusters(url, headers, logger)
@@ -120,7 +125,7 @@ def list_clusters(url, headers, logger):
 
 def get_username_by_user_id(user_id, url, headers, logger):
     logger.info(f"get username by user_id: {user_id}")
-    resp = requests.get(f"{url}/v3/users/{user_id}", headers=headers, verify=False)
+    resp = session.get(f"{url}/v3/users/{user_id}", headers=headers, verify=False)
 
 
 def get_projects(url, headers, logger, cluster_id):
@@ -128,7 +133,7 @@ def get_projects(url, headers, logger, cluster_id):
     get the projects in the cluster
     """
     logger.info(f"get cluster [{cluster_id}] projects as following:\n")
-    resp = requests.get(
+    resp = session.get(
         f"{url}/v3/projects",
         headers=headers,
         params={"clusterId": cluster_id},
@@ -152,7 +157,7 @@ def fetch_all_templates(rancher_url, headers, logger):
 
     # Global
     globals_ = (
-        requests.get(f"{rancher_url}/v3/globalroles", headers=headers, verify=False)
+        session.get(f"{rancher_url}/v3/globalroles", headers=headers, verify=False)
         .json()
         .get("data", [])
     )
@@ -161,7 +166,7 @@ def fetch_all_templates(rancher_url, headers, logger):
     ]
 
     # Cluster
-    cluster_resp = requests.get(
+    cluster_resp = session.get(
         f"{rancher_url}/v3/roletemplates?context=cluster&limit=1000",
         headers=headers,
         verify=False,
@@ -176,7 +181,7 @@ def fetch_all_templates(rancher_url, headers, logger):
 
     # Project
     projects = (
-        requests.get(
+        session.get(
             f"{rancher_url}/v3/roletemplates?context=project&limit=1000",
             headers=headers,
             verify=False,
@@ -216,7 +221,7 @@ def get_role_display_name(role_id, url, headers, logger, builtin_roles_cache=Non
     else:
         # logger.info(f'build-in role_id: {role_id}')
         return role_id
-    resp = requests.get(f"{url}/v3/{endpoint}/{role_id}", headers=headers, verify=False)
+    resp = session.get(f"{url}/v3/{endpoint}/{role_id}", headers=headers, verify=False)
     if resp.status_code != 200:
         logger.error(f"fail to get role name for{role_id}: HTTP {resp.status_code}")
         return None
@@ -226,7 +231,7 @@ def get_role_display_name(role_id, url, headers, logger, builtin_roles_cache=Non
 
 def get_username_by_user_id(principal_id, url, headers, logger=None):
     user_id = principal_id.strip("local://")
-    resp = requests.get(f"{url}/v3/users/{user_id}", headers=headers, verify=False)
+    resp = session.get(f"{url}/v3/users/{user_id}", headers=headers, verify=False)
     if resp.status_code == 200:
         data = resp.json()
         return data.get("username") or data.get("name") or user_id
@@ -234,13 +239,10 @@ def get_username_by_user_id(principal_id, url, headers, logger=None):
 
 
 # ------------------- list the given user rolebindings   -------------------
-def list_bindings(user_id, url, headers, logger):
-    logger.info(f"get the rolebindings of the user: {user_id}")
-    bindings = []
-
+def load_builtin_roles(url, headers, logger):
     builtin_roles_cache = {}
     try:
-        resp = requests.get(
+        resp = session.get(
             f"{url}/v3/roletemplates?builtin=true", headers=headers, verify=False
         )
         if resp.status_code == 200:
@@ -255,6 +257,21 @@ def list_bindings(user_id, url, headers, logger):
             logger.error(f"load builtin roles failed: HTTP {resp.status_code}")
     except Exception as e:
         logger.error(f"load builtin roles failed: {str(e)}")
+    return builtin_roles_cache
+
+
+def list_bindings(
+    user_id, url, headers, logger, builtin_roles_cache=None, resolve_names=True
+):
+    """
+    resolve_names=False skips the role catalog and name lookups,
+    roleName is then None; bind/unbind only match on ids
+    """
+    logger.info(f"get the rolebindings of the user: {user_id}")
+    bindings = []
+
+    if builtin_roles_cache is None and resolve_names:
+        builtin_roles_cache = load_builtin_roles(url, headers, logger)
 
     endpoints = [
         ("globalrolebindings", "global", "globalRoleId"),
@@ -262,7 +279,7 @@ def list_bindings(user_id, url, headers, logger):
         ("projectroletemplatebindings", "project", "roleTemplateId"),
     ]
     for ep, level, key in endpoints:
-        resp = requests.get(
+        resp = session.get(
             f"{url}/v3/{ep}?userId={user_id}", headers=headers, verify=False
         )
         resp.raise_for_status()
@@ -271,9 +288,11 @@ def list_bindings(user_id, url, headers, logger):
 
             if not rid:
                 continue
-            name = builtin_roles_cache.get(rid)
-            if not name:
-                name = get_role_display_name(rid, url, headers, logger) if rid else None
+            name = None
+            if resolve_names:
+                name = builtin_roles_cache.get(rid)
+                if not name:
+                    name = get_role_display_name(rid, url, headers, logger)
 
             bindings.append(
                 {
@@ -289,62 +308,199 @@ def list_bindings(user_id, url, headers, logger):
 
 
 # ------------------- check role exists   -------------------
-def role_exists(role_id, level, url, headers, logger):
-    if level == "global":
-        ep = "globalroles"
-        key = "id"
-    else:
-        ep = "roletemplates"
-        key = "id"
-    resp = requests.get(f"{url}/v3/{ep}", headers=headers, verify=False)
-    resp.raise_for_status()
-    roles = resp.json().get("data", [])
-    if level == "global":
-        return any(r.get(key) == role_id for r in roles)
-    else:
-        return any(r.get(key) == role_id and r.get("context") == level for r in roles)
+class ValidationCache:
+    """
+    role and target objects keyed by (endpoint, id), shared by every level.
+    a 404 is kept for negative_ttl seconds, so an object created meanwhile is
+    found again; a transient or auth error raises and is never kept
+    """
+
+    negative_ttl = 60
+
+    def __init__(self):
+        self.objects = {}
+
+    def get(self, key):
+        """
+        the cached object, False for a live 404, None when unknown
+        """
+        entry = self.objects.get(key)
+        if entry is None:
+            return None
+        data, stored_at = entry
+        if data is False and time.monotonic() - stored_at > self.negative_ttl:
+            del self.objects[key]
+            return None
+        return data
+
+    def put(self, key, data):
+        self.objects[key] = (data, time.monotonic())
+
+    def clear(self):
+        self.objects.clear()
+
+
+validation_cache = ValidationCache()
+
+
+def clear_validation_cache():
+    validation_cache.clear()
+
+
+_worker = threading.local()
+
+
+def _http():
+    # requests.Session isn't documented as thread-safe, so pool workers get their own
+    if threading.current_thread() is threading.main_thread():
+        return session
+    if not hasattr(_worker, "session"):
+        _worker.session = requests.Session()
+    return _worker.session
+
+
+def _lookup(ep, obj_id, url, headers):
+    """
+    GET one object by id through the validation cache:
+    the json on 200, False on 404, raise on other errors
+    """
+    data = validation_cache.get((ep, obj_id))
+    if data is None:
+        resp = _http().get(f"{url}/v3/{ep}/{obj_id}", headers=headers, verify=False)
+        if resp.status_code == 404:
+            data = False
+        else:
+            resp.raise_for_status()
+            data = resp.json()
+        validation_cache.put((ep, obj_id), data)
+    return data
+
+
+def _role_endpoint(level):
+    return "globalroles" if level == "global" else "roletemplates"
+
+
+def role_exists(role_id, level, url, headers, logger, role_ids=None):
+    """
+    check the role in the given level by direct id lookup,
+    or against role_ids (a cached set of role ids of that level) when given
+    """
+    if role_ids is not None:
+        return role_id in role_ids
+    data = _lookup(_role_endpoint(level), role_id, url, headers)
+    return bool(data) and (level == "global" or data.get("context") == level)
 
 
 # ------------------- check target exists   -------------------
+TARGET_ENDPOINTS = {"cluster": "clusters", "project": "projects"}
+
+
 def validate_target_exists(level, target, url, headers, logger):
     if level == "global":
         return True
-    endpoint_map = {"cluster": "clusters", "project": "projects"}
-    endpoint_key = endpoint_map[level]
+    endpoint_key = TARGET_ENDPOINTS.get(level)
     if not endpoint_key:
         logger.error(f"not support the level: {level}")
         return False
-    
-    target_url = f"{url}/v3/{endpoint_key}/{target}"
-    try:
-        resp = requests.get(target_url, headers=headers, verify=False)
-        if resp.status_code == 200:
-            return True
-        elif resp.status_code == 404:
-            logger.error(f"the target [{target}] not exist in the {level}")
-    except requests.exceptions.RequestException as e:
-        logger.error(f"request error: {str(e)} | URL: {target_url}")
-    return False
+
+    if not _lookup(endpoint_key, target, url, headers):
+        logger.error(f"the target [{target}] not exist in the {level}")
+        return False
+    return True
+
+
+def validate_bindings(items, url, headers, logger, role_ids=None, max_workers=8):
+    """
+    validate many (role_id, level, target) tuples in one pass.
+    every distinct role and target object is fetched once, concurrently when
+    there is more than one item; the checks then run on the cached objects.
+    role_ids optionally maps level -> cached set of role ids.
+    returns one bool per item; a transient or auth error raises
+    """
+    items = list(items)
+    role_ids = role_ids or {}
+
+    if len(items) > 1:
+        keys = {
+            (_role_endpoint(level), role_id)
+            for role_id, level, _ in items
+            if role_ids.get(level) is None
+        } | {
+            (TARGET_ENDPOINTS[level], target)
+            for _, level, target in items
+            if level in TARGET_ENDPOINTS
+        }
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            # list() re-raises the first failed fetch
+            list(pool.map(lambda k: _lookup(k[0], k[1], url, headers), keys))
+
+    result = []
+    for role_id, level, target in items:
+        ok = validate_target_exists(level, target, url, headers, logger)
+        if not role_exists(role_id, level, url, headers, logger, role_ids.get(level)):
+            logger.error(f"Not existing the [{role_id}] in {level} level")
+            ok = False
+        result.append(ok)
+    return result
+
+
+def apply_to_targets(
+    func,
+    user_id,
+    role_id,
+    level,
+    targets,
+    url,
+    headers,
+    logger,
+    role_ids=None,
+    **kwargs,
+):
+    """
+    run bind_role/unbind_role for one role on several targets: the targets are
+    validated in one batched pass first, then func runs on each valid one
+    """
+    items = [(role_id, level, target) for target in targets]
+    valid = validate_bindings(items, url, headers, logger, role_ids=role_ids)
+    return [
+        func(
+            user_id,
+            role_id,
+            level,
+            target,
+            url,
+            headers,
+            logger,
+            role_ids=role_ids,
+            **kwargs,
+        )
+        for (_, _, target), ok in zip(items, valid)
+        if ok
+    ]
 
 
 # ------------------- bind and unbind   ----------------------
 def bind_role(
-    user_id, role_id, level, target, url, headers, logger, duration_minutes=None
+    user_id,
+    role_id,
+    level,
+    target,
+    url,
+    headers,
+    logger,
+    duration_minutes=None,
+    role_ids=None,
 ):
-    # check target if exists
-    if level != "global" and not validate_target_exists(
-        level, target, url, headers, logger
-    ):
-        return None
-
-    # check role exists
-    # 1. check if the role in the given level exists
-    if not role_exists(role_id, level, url, headers, logger):
-        logger.error(f"Not existing the [{role_id}] in {level} level")
+    # 1. check the target and the role in the given level exist
+    if not validate_bindings(
+        [(role_id, level, target)], url, headers, logger, role_ids=role_ids
+    )[0]:
         return None
 
     # 2. check the current bindings, and if the binding exists, skip
-    current_bindings = list_bindings(user_id, url, headers, logger)
+    current_bindings = list_bindings(
+        user_id, url, headers, logger, resolve_names=False
+    )
     for b in current_bindings:
         if b["roleId"] == role_id and b["level"] == level and b["target"] == target:
             logger.info(
@@ -356,14 +512,20 @@ def bind_role(
     logger.info(f"bind: user={user_id}, role={role_id}, level={level}, target={target}")
     payload = {"userId": user_id}
     annotations = {}
+    labels = {}
 
     if duration_minutes:
-        current_time = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
+        # canonical UTC times; cron_unbind.py sweeps on tempbind-expires-at
+        created_time = datetime.now(timezone.utc).replace(microsecond=0)
+        expire_time = created_time + timedelta(minutes=duration_minutes)
         annotations = {
             "rancher.io/tempbind": "true",
-            "rancher.io/tempbind-created": str(current_time),
+            "rancher.io/tempbind-created": created_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
             "rancher.io/tempbind-duration": str(duration_minutes),
+            "rancher.io/tempbind-expires-at": expire_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
         }
+        # label values can't hold ':', so the label carries the epoch seconds
+        labels = {"rancher.io/tempbind-expires-at": str(int(expire_time.timestamp()))}
 
     if level == "global":
         payload["globalRoleId"] = role_id
@@ -379,8 +541,10 @@ def bind_role(
 
     if annotations:
         payload["annotations"] = annotations
+    if labels:
+        payload["labels"] = labels
 
-    resp = requests.post(f"{url}/v3/{ep}", headers=headers, json=payload, verify=False)
+    resp = session.post(f"{url}/v3/{ep}", headers=headers, json=payload, verify=False)
     resp.raise_for_status()
     bid = resp.json().get("id")
     logger.info(f"bind successfully: bindingId={bid}")
@@ -388,24 +552,27 @@ def bind_role(
     return bid
 
 
-def unbind_role(user_id, role_id, level, target, url, headers, logger):
-
-    # check target if exists
-    if level != "global" and not validate_target_exists(
-        level, target, url, headers, logger
-    ):
-        return None
+def unbind_role(
+    user_id,
+    role_id,
+    level,
+    target,
+    url,
+    headers,
+    logger,
+    role_ids=None,
+):
 
-    # check role exists
-    # 1. check if the role in the given level exists
-    if not role_exists(role_id, level, url, headers, logger):
-        logger.error(f"Not existing the [{role_id}] in {level} level")
+    # check the target and the role in the given level exist
+    if not validate_bindings(
+        [(role_id, level, target)], url, headers, logger, role_ids=role_ids
+    )[0]:
         return None
 
     logger.info(
         f"try unbind: user={user_id}, role={role_id}, level={level}, target={target}"
     )
-    bindings = list_bindings(user_id, url, headers, logger)
+    bindings = list_bindings(user_id, url, headers, logger, resolve_names=False)
     matched = [
         b
         for b in bindings
@@ -426,7 +593,7 @@ def unbind_role(user_id, role_id, level, target, url, headers, logger):
         else:
             ep = f"projectroletemplatebindings/{binding_id}"
 
-        resp = requests.delete(f"{url}/v3/{ep}", headers=headers, verify=False)
+        resp = session.delete(f"{url}/v3/{ep}", headers=headers, verify=False)
         if resp.status_code in (200, 204):
             logger.info(f"unbind successfully: {binding_id}")
         else:
@@ -436,18 +603,22 @@ def unbind_role(user_id, role_id, level, target, url, headers, logger):
 # --------------------- view RoleTemplate  ---------------------
 def view_role_template(role_id, url, headers, logger):
     logger.info(f"read out context RoleTemplate: {role_id}")
-    resp = requests.get(
+    resp = session.get(
         f"{url}/v3/roleTemplates/{role_id}", headers=headers, verify=False
     )
     resp.raise_for_status()
     print(json.dumps(resp.json(), indent=2, ensure_ascii=False))
 
 
-def main():
-    logger = init_logger()
-    url, key, secret = init_config()
-    headers = init_headers(key, secret)
+def positive_int(value):
+    # --duration=0 would silently make the binding permanent
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {value}")
+    return number
+
 
+def build_parser():
     parser = argparse.ArgumentParser(description="Rancher RoleTemplate CLI")
     sub = parser.add_subparsers(dest="cmd", required=True)
 
@@ -473,7 +644,9 @@ def main():
     p_bind.add_argument("roleId")
     p_bind.add_argument("level", choices=["global", "cluster", "project"])
     # if choices in ['cluster', 'project'], need target
-    p_bind.add_argument("--target", default="")
+    p_bind.add_argument("--target", default="", help="obj ID, comma separated for several")
+    # temporary binding, unbound by cron_unbind.py once expired
+    p_bind.add_argument("--duration", type=positive_int, default=None, help="minutes")
 
     # p_temp = sub.add_parser(
     #     "tempbind", help="bind the role to the given user with a temporary duration"
@@ -489,80 +662,135 @@ def main():
     p_unbind.add_argument("roleId")
     p_unbind.add_argument("level", choices=["global", "cluster", "project"])
       # if choices in ['cluster', 'project'], need target
-    p_unbind.add_argument("--target", default="")
+    p_unbind.add_argument("--target", default="", help="obj ID, comma separated for several")
 
     p_view = sub.add_parser("view", help="query the RoleTemplate context from roleId")
     p_view.add_argument("roleId")
 
+    sub.add_parser("shell", help="interactive shell with cached lookups")
+
+    return parser, sub
+
+
+def check_args(parser, args):
+    # # check the args validity before request
+    #if args.cmd in ["bind", "tempbind", "unbind"]:
+    if args.cmd in ["bind", "unbind"]:
+        if args.level in ["cluster", "project"] and not args.target:
+            parser.error(
+                f"--target the param on level={args.level} is must。pleaase add  --target=<obj ID>"
+            )
+        elif args.level == "global" and args.target:
+            parser.error(
+                f"--target the param on level={args.level} is not allowed。pleaase remove --target=<obj ID>"
+            )
+
+
+def split_targets(target):
+    # --target=local:p-1,local:p-2 binds/unbinds several targets in one call
+    return [t.strip() for t in target.split(",") if t.strip()] or [""]
+
+
+def print_bindings(items):
+    if not items:
+        print("(none)")
+    else:
+        for b in items:
+            print(
+                f"{b['level']:<7} | {b['roleId']:<12} | {b['roleName'] or '' :<25} | target={b['target']}"
+            )
+
+
+def run_command(args, url, headers, logger):
+    if args.cmd == "list":
+        uid = get_user_id(args.username, url, headers, logger)
+        if not uid:
+            print("(none)")
+            return False
+        print_bindings(list_bindings(uid, url, headers, logger))
+
+    elif args.cmd == "bind":
+        uid = get_user_id(args.username, url, headers, logger)
+        apply_to_targets(
+            bind_role,
+            uid,
+            args.roleId,
+            args.level,
+            split_targets(args.target),
+            url,
+            headers,
+            logger,
+            duration_minutes=args.duration,
+        )
+
+    elif args.cmd == "unbind":
+        uid = get_user_id(args.username, url, headers, logger)
+        apply_to_targets(
+            unbind_role,
+            uid,
+            args.roleId,
+            args.level,
+            split_targets(args.target),
+            url,
+            headers,
+            logger,
+        )
+
+    # for tempbind，only set the annotation for the mapping
+    # elif args.cmd == "tempbind":
+    #     uid = get_user_id(args.username, url, headers, logger)
+    #     binding_id=bind_role(
+    #         uid,
+    #         args.roleId,
+    #         args.level,
+    #         args.target,
+    #         url,
+    #         headers,
+    #         logger,
+    #         duration_minutes=args.duration,
+    #     )
+    #     if binding_id:
+    #         print(f"Will automatically unbind after {args.duration} minutes")
+        # time.sleep(args.duration * 60)
+        # unbind_role(uid, args.roleId, args.level, args.target, url, headers, logger)
+
+    elif args.cmd == "view":
+        view_role_template(args.roleId, url, headers, logger)
+    elif args.cmd == "list-roleTemplates":
+        templates = fetch_all_templates(url, headers, logger)
+        print_templates(templates)
+    elif args.cmd == "list-clusters":
+        list_clusters(url, headers, logger)
+    elif args.cmd == "list-projects":
+        list_projects(url, headers, logger, args.cluster)
+    elif args.cmd == "list-users":
+        list_users(url, headers, logger)
+    elif args.cmd == "list-cluster-members":
+        list_cluster_members(args.cluster, url, headers, logger)
+    return True
+
+
+def main():
+    logger = init_logger()
+    url, key, secret = init_config()
+    headers = init_headers(key, secret)
+
+    parser, sub = build_parser()
     args = parser.parse_args()
+    check_args(parser, args)
 
     try:
-        # # check the args validity before request
-        #if args.cmd in ["bind", "tempbind", "unbind"]:
-        if args.cmd in ["bind", "unbind"]:
-            if args.level in ["cluster", "project"] and not args.target:
-                parser.error(
-                    f"--target the param on level={args.level} is must。pleaase add  --target=<obj ID>"
-                )
-            elif args.level == "global" and args.target:
-                parser.error(
-                    f"--target the param on level={args.level} is not allowed。pleaase remove --target=<obj ID>"
-                )
-
-        if args.cmd == "list":
-            uid = get_user_id(args.username, url, headers, logger)
-            if not uid:
-                print("(none)")
-                sys.exit(1)
-            items = list_bindings(uid, url, headers, logger)
-            if not items:
-                print("(none)")
-            else:
-                for b in items:
-                    print(
-                        f"{b['level']:<7} | {b['roleId']:<12} | {b['roleName'] or '' :<25} | target={b['target']}"
-                    )
-
-        elif args.cmd == "bind":
-            uid = get_user_id(args.username, url, headers, logger)
-            bind_role(uid, args.roleId, args.level, args.target, url, headers, logger)
-
-        elif args.cmd == "unbind":
-            uid = get_user_id(args.username, url, headers, logger)
-            unbind_role(uid, args.roleId, args.level, args.target, url, headers, logger)
-
-        # for tempbind，only set the annotation for the mapping
-        # elif args.cmd == "tempbind":
-        #     uid = get_user_id(args.username, url, headers, logger)
-        #     binding_id=bind_role(
-        #         uid,
-        #         args.roleId,
-        #         args.level,
-        #         args.target,
-        #         url,
-        #         headers,
-        #         logger,
-        #         duration_minutes=args.duration,
-        #     )
-        #     if binding_id:
-        #         print(f"Will automatically unbind after {args.duration} minutes")
-            # time.sleep(args.duration * 60)
-            # unbind_role(uid, args.roleId, args.level, args.target, url, headers, logger)
-
-        elif args.cmd == "view":
-            view_role_template(args.roleId, url, headers, logger)
-        elif args.cmd == "list-roleTemplates":
-            templates = fetch_all_templates(url, headers, logger)
-            print_templates(templates)
-        elif args.cmd == "list-clusters":
-            list_clusters(url, headers, logger)
-        elif args.cmd == "list-projects":
-            list_projects(url, headers, logger, args.cluster)
-        elif args.cmd == "list-users":
-            list_users(url, headers, logger)
-        elif args.cmd == "list-cluster-members":
-            list_cluster_members(args.cluster, url, headers, logger)
-    
+        if args.cmd == "shell":
+            from rancher_cli.shell import RancherShell
+
+            # hand over this module, under `python main.py` it is __main__
+            # and importing rancher_cli.main would load a second copy
+            commands = [c for c in sub.choices if c != "shell"]
+            RancherShell(
+                sys.modules[__name__], parser, commands, url, headers, logger
+            ).cmdloop()
+        elif not run_command(args, url, headers, logger):
+            sys.exit(1)
 
     except Exception as e:
         logger.exception(f"Error: {e}")
@@ -0,0 +1,320 @@
+"""
+Rancher RoleTemplate CLI interactive shell
+ - one pooled session for all commands
+ - users, clusters, projects and roles are loaded once and reused
+ - bindings are cached per user and dropped on bind/unbind
+ - tab completion of usernames, role ids and cluster/project ids
+"""
+import cmd
+import shlex
+
+LEVELS = ["global", "cluster", "project"]
+
+
+# ------------------- session cache   -------------------
+class SessionCache:
+    def __init__(self, cli, url, headers, logger):
+        # cli is the running main module, see RancherShell
+        self.cli = cli
+        self.url = url
+        self.headers = headers
+        self.logger = logger
+        self.clear()
+
+    def clear(self):
+        self._users = None
+        self._clusters = None
+        self._projects = None
+        self._templates = None
+        self._bindings = {}
+        # the role/target answers of bind/unbind, including the cached 404s
+        self.cli.clear_validation_cache()
+
+    def invalidate(self, user_id):
+        # bind/unbind only change the bindings, the catalogs stay warm
+        self._bindings.pop(user_id, None)
+
+    def _get_all(self, ep):
+        # follow pagination.next, a single page silently drops the rest
+        data = []
+        page_url = f"{self.url}/v3/{ep}"
+        while page_url:
+            resp = self.cli.session.get(page_url, headers=self.headers, verify=False)
+            resp.raise_for_status()
+            page = resp.json()
+            data.extend(page.get("data", []))
+            page_url = (page.get("pagination") or {}).get("next")
+        return data
+
+    def users(self):
+        if self._users is None:
+            self.logger.info("get all users")
+            self._users = self._get_all("users")
+        return self._users
+
+    def user_id(self, username):
+        for u in self.users():
+            if u.get("username") == username:
+                return u.get("id")
+        # not in the cached list, ask the server-side username filter
+        return self.cli.get_user_id(username, self.url, self.headers, self.logger)
+
+    def username(self, principal_id):
+        user_id = principal_id.split("://")[-1]
+        for u in self.users():
+            if u.get("id") == user_id:
+                return u.get("username") or u.get("name") or user_id
+        return user_id
+
+    def clusters(self):
+        if self._clusters is None:
+            self.logger.info("get all clusters")
+            self._clusters = self._get_all("clusters")
+        return self._clusters
+
+    def cluster_id(self, cluster):
+        # accept both the cluster name and the cluster id
+        for c in self.clusters():
+            if cluster in (c.get("name"), c.get("id")):
+                return c["id"]
+        print(f"[ERROR] Cluster '{cluster}' not found.")
+        return None
+
+    def projects(self):
+        if self._projects is None:
+            self.logger.info("get all projects")
+            self._projects = self._get_all("projects")
+        return self._projects
+
+    def templates(self):
+        if self._templates is None:
+            catalogs = {
+                "global": "globalroles",
+                "cluster": "roletemplates?context=cluster",
+                "project": "roletemplates?context=project",
+            }
+            self._templates = {
+                level: [
+                    (r["id"], r.get("displayName") or r.get("name"))
+                    for r in self._get_all(ep)
+                ]
+                for level, ep in catalogs.items()
+            }
+        return self._templates
+
+    def role_ids(self):
+        return {
+            level: {rid for rid, _ in roles} for level, roles in self.templates().items()
+        }
+
+    def role_names(self):
+        return {
+            rid: name
+            for roles in self.templates().values()
+            for rid, name in roles
+            if name
+        }
+
+    def bindings(self, user_id):
+        if user_id not in self._bindings:
+            self._bindings[user_id] = self.cli.list_bindings(
+                user_id,
+                self.url,
+                self.headers,
+                self.logger,
+                builtin_roles_cache=self.role_names(),
+            )
+        return self._bindings[user_id]
+
+
+# ------------------- interactive shell   -------------------
+class RancherShell(cmd.Cmd):
+    intro = "Rancher RoleTemplate shell, type help or ? to list commands, exit to quit."
+    prompt = "rancher> "
+    # the CLI subcommands are hyphenated, e.g. list-cluster-members
+    identchars = cmd.Cmd.identchars + "-"
+
+    def __init__(self, cli, parser, commands, url, headers, logger):
+        """
+        cli is the running main module; it is passed in rather than imported
+        so the shell shares its session and validation cache
+        """
+        super().__init__()
+        self.cli = cli
+        self.parser = parser
+        self.commands = commands
+        self.url = url
+        self.headers = headers
+        self.logger = logger
+        self.cache = SessionCache(cli, url, headers, logger)
+
+    def preloop(self):
+        try:
+            import readline
+
+            # keep --target=local:p-xxx as one word when completing
+            readline.set_completer_delims(" \t\n")
+        except ImportError:
+            pass
+
+    def emptyline(self):
+        pass
+
+    def do_exit(self, arg):
+        """exit the shell"""
+        return True
+
+    do_quit = do_exit
+    do_EOF = do_exit
+
+    def do_refresh(self, arg):
+        """drop all cached users, clusters, projects, roles, bindings and role/target checks"""
+        self.cache.clear()
+
+    def do_help(self, arg):
+        if arg in self.commands:
+            # help bind == bind -h
+            self.default(f"{arg} -h")
+            return
+        if arg:
+            # the shell's own commands document themselves in do_* docstrings
+            return super().do_help(arg)
+        self.parser.print_help()
+        print("\nshell commands:\n  refresh             drop the caches\n  exit                quit")
+
+    def default(self, line):
+        try:
+            args = self.parser.parse_args(shlex.split(line))
+            self.cli.check_args(self.parser, args)
+        except SystemExit:
+            # argparse already printed the usage error
+            return
+        if args.cmd == "shell":
+            return
+        try:
+            self.run(args)
+        except Exception as e:
+            self.logger.exception(f"Error: {e}")
+
+    def run(self, args):
+        cache = self.cache
+        if args.cmd == "list":
+            uid = cache.user_id(args.username)
+            if not uid:
+                print("(none)")
+                return
+            self.cli.print_bindings(cache.bindings(uid))
+
+        elif args.cmd in ("bind", "unbind"):
+            uid = cache.user_id(args.username)
+            if not uid:
+                return
+            kwargs = {"role_ids": cache.role_ids()}
+            if args.cmd == "bind":
+                kwargs["duration_minutes"] = args.duration
+                func = self.cli.bind_role
+            else:
+                func = self.cli.unbind_role
+            try:
+                self.cli.apply_to_targets(
+                    func,
+                    uid,
+                    args.roleId,
+                    args.level,
+                    self.cli.split_targets(args.target),
+                    self.url,
+                    self.headers,
+                    self.logger,
+                    **kwargs,
+                )
+            finally:
+                cache.invalidate(uid)
+
+        elif args.cmd == "list-users":
+            for u in cache.users():
+                print(f"{u['id']}\t{u.get('name', '')}")
+
+        elif args.cmd == "list-clusters":
+            for c in cache.clusters():
+                print(f"{c['id']}\t{c.get('name', '')}")
+
+        elif args.cmd == "list-projects":
+            projects = [
+                p for p in cache.projects() if p.get("clusterId") == args.cluster
+            ]
+            if not projects:
+                print("(none)")
+            for p in projects:
+                print(f"{p['id']}\t{p.get('name', '')}")
+
+        elif args.cmd == "list-roleTemplates":
+            self.cli.print_templates(cache.templates())
+
+        elif args.cmd == "list-cluster-members":
+            cluster_id = cache.cluster_id(args.cluster)
+            if not cluster_id:
+                print("(none)")
+                return
+            members = self.cli.get_cluster_members(
+                cluster_id, self.url, self.headers, self.logger
+            )
+            if not members:
+                print("(none)")
+            role_names = cache.role_names()
+            for m in members:
+                principal_id = m.get("userPrincipalId") or m.get("groupPrincipalId") or ""
+                role_id = m.get("roleTemplateId")
+                role_name = role_names.get(role_id) or role_id
+                print(f"- {cache.username(principal_id):<25} => {role_name} [{role_id}]")
+
+        else:
+            self.cli.run_command(args, self.url, self.headers, self.logger)
+
+    # ------------------- tab completion   -------------------
+    def completenames(self, text, *ignored):
+        return [c for c in self.commands + ["refresh", "exit"] if c.startswith(text)]
+
+    def completedefault(self, text, line, begidx, endidx):
+        words = line[:begidx].split()
+        command = words[0] if words else ""
+        # positional words already typed, options excluded
+        pos = len([w for w in words[1:] if not w.startswith("-")])
+        try:
+            if text.startswith("--target="):
+                # complete the last id of a comma separated list
+                done, _, last = text[len("--target="):].rpartition(",")
+                done = f"{done}," if done else ""
+                return [
+                    f"--target={done}{t}"
+                    for t in self._targets(words)
+                    if t.startswith(last)
+                ]
+            if words and words[-1] in ("--cluster", "-c"):
+                candidates = [c["id"] for c in self.cache.clusters()]
+            elif command in ("list", "bind", "unbind") and pos == 0:
+                candidates = [u["username"] for u in self.cache.users() if u.get("username")]
+            elif command in ("bind", "unbind") and pos == 1:
+                candidates = sorted({rid for ids in self.cache.role_ids().values() for rid in ids})
+            elif command in ("bind", "unbind") and pos == 2:
+                candidates = LEVELS
+            elif command == "view" and pos == 0:
+                candidates = sorted(
+                    self.cache.role_ids().get("cluster", set())
+                    | self.cache.role_ids().get("project", set())
+                )
+            elif command in ("bind", "unbind"):
+                candidates = ["--target="]
+            else:
+                candidates = []
+        except Exception as e:
+            self.logger.error(f"completion failed: {e}")
+            return []
+        return [c for c in candidates if c.startswith(text)]
+
+    def _targets(self, words):
+        level = next((w for w in words if w in LEVELS), None)
+        if level == "cluster":
+            return [c["id"] for c in self.cache.clusters()]
+        if level == "project":
+            return [p["id"] for p in self.cache.projects()]
+        return []